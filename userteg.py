@@ -6,16 +6,152 @@ Professional Intelligence Gathering System
 """
 
 import os
+import re
 import sys
 import json
 import time
+import queue
+import logging
 import sqlite3
+import threading
+import functools
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
 import argparse
+from contextlib import contextmanager
+from array import array
+from operator import itemgetter
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Iterable, Iterator, Tuple
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+__all__ = [
+    'Colors',
+    'FolderStructure',
+    'ConfigManager',
+    'DatabaseManager',
+    'BannerDisplay',
+    'UserTegOSINT',
+    'MenuSystem',
+    'watchlist_scan',
+    'setup_token',
+    'main',
+]
+
+logger = logging.getLogger('userteg')
+
+# ============================================================================
+# JSON HELPERS - orjson when installed, stdlib json otherwise
+# ============================================================================
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, default=str).encode('utf-8')
+
+def _json_loads(data: bytes) -> Any:
+    """Parse JSON from bytes or str"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# ============================================================================
+# MESSAGE TEXT COMPRESSION - zstd when installed, plain TEXT otherwise
+# ============================================================================
+
+# Shorter texts are stored as plain TEXT; a zstd frame would not pay for itself
+_COMPRESS_MIN_BYTES = 128
+# Leading byte of a compressed BLOB, leaving room for other encodings later
+_ZSTD_FLAG = b'\x01'
+
+def _pack_text(text: Optional[str], compressor=None):
+    """Encode message text for storage, compressing it when worthwhile"""
+    if compressor is None or not text:
+        return text
+    raw = text.encode('utf-8')
+    if len(raw) < _COMPRESS_MIN_BYTES:
+        return text
+    packed = compressor.compress(raw)
+    if len(packed) + 1 >= len(raw):
+        return text
+    return _ZSTD_FLAG + packed
+
+def _unpack_text(value):
+    """Decode message text written by _pack_text; plain TEXT passes through"""
+    if not isinstance(value, bytes):
+        return value
+    if value[:1] == _ZSTD_FLAG:
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read compressed messages")
+        value = zstandard.ZstdDecompressor().decompress(value[1:])
+    return value.decode('utf-8')
+
+# ============================================================================
+# WATCHLIST MATCHING - hyperscan when installed, re otherwise
+# ============================================================================
+
+def watchlist_scan(rows: Iterable[Tuple[int, int, int, Optional[str]]],
+                   patterns: List[str]) -> Iterator[Dict]:
+    """Match message rows against many case-insensitive regex patterns in one pass
+
+    Rows are (message_id, chat_id, user_id, text); one dict is yielded per
+    matching (row, pattern) pair.
+    """
+    if not patterns:
+        return
+
+    if hyperscan is not None:
+        db = hyperscan.Database()
+        flags = hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_UTF8
+        db.compile(
+            expressions=[p.encode('utf-8') for p in patterns],
+            ids=list(range(len(patterns))),
+            elements=len(patterns),
+            flags=[flags] * len(patterns)
+        )
+        hits = []
+
+        def on_match(pattern_id, start, end, match_flags, context=None):
+            hits.append(pattern_id)
+
+        def matching(text):
+            hits.clear()
+            db.scan(text.encode('utf-8'), match_event_handler=on_match)
+            return sorted(hits)
+    else:
+        compiled = [re.compile(p, re.IGNORECASE) for p in patterns]
+
+        def matching(text):
+            return [i for i, regex in enumerate(compiled) if regex.search(text)]
+
+    for message_id, chat_id, user_id, text in rows:
+        if not text:
+            continue
+        for pattern_id in matching(text):
+            yield {
+                'message_id': message_id,
+                'chat_id': chat_id,
+                'user_id': user_id,
+                'pattern': patterns[pattern_id]
+            }
+
 # ============================================================================
 # COLOR SYSTEM - Vintage Blue Gradient Theme
 # ============================================================================
@@ -41,6 +177,58 @@ class Colors:
     RESET = '\033[0m'
     BLINK = '\033[5m'
 
+# Color combinations used by the menu screens, joined and interned once at import
+_C_HDR = sys.intern(Colors.BLUE2 + Colors.BOLD)
+_C_CAT = sys.intern(Colors.CYAN2 + Colors.BOLD)
+_C_ITEM = sys.intern(Colors.CYAN3)
+_C_BOLD = sys.intern(Colors.BOLD)
+_C_DIM = sys.intern(Colors.DIM)
+_C_SUCCESS = sys.intern(Colors.SUCCESS)
+_C_WARNING = sys.intern(Colors.WARNING)
+_C_INFO = sys.intern(Colors.INFO)
+_C_RESET = sys.intern(Colors.RESET)
+
+# Horizontal rules drawn across the 70-column layout
+_RULE_LIGHT = '─' * 70
+_RULE_HEAVY = '═' * 70
+
+# Exit banner around the data directory, which is only known at runtime
+_FAREWELL_OPEN = f"\n{_C_CAT}{_RULE_HEAVY}\n  Thank you for using USERTEG\n  Intelligence data saved to: "
+_FAREWELL_CLOSE = f"\n{_RULE_HEAVY}{_C_RESET}\n\n"
+
+# Interactive prompts, formatted once instead of at every input() call
+PROMPT_UID = sys.intern(f"{Colors.CYAN2}[?] Enter User ID: {Colors.RESET}")
+PROMPT_USERNAME = sys.intern(f"{Colors.CYAN2}[?] Enter username: {Colors.RESET}")
+PROMPT_KEYWORD = sys.intern(f"{Colors.CYAN2}[?] Enter keyword: {Colors.RESET}")
+PROMPT_TOKEN = sys.intern(f"{Colors.CYAN2}[?] Enter your bot token: {Colors.RESET}")
+PROMPT_USE_EXISTING_TOKEN = sys.intern(f"{Colors.CYAN2}Use existing token? (y/n): {Colors.RESET}")
+PROMPT_SAVE_TOKEN = sys.intern(f"{Colors.CYAN2}Save token for future use? (y/n): {Colors.RESET}")
+PROMPT_CHOICE = sys.intern(f"\n{Colors.CYAN2}{Colors.BOLD}[?] Select option: {Colors.RESET}")
+
+# Erase the display and move the cursor home
+_CLEAR_SCREEN = '\x1b[2J\x1b[H'
+
+def _enable_ansi_console():
+    """Turn on escape-sequence processing for the Windows console; a no-op elsewhere"""
+    if os.name != 'nt':
+        return
+    try:
+        import ctypes
+        from ctypes import wintypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+        mode = wintypes.DWORD()
+        if kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+            kernel32.SetConsoleMode(handle, mode.value | 0x0004)
+    except (ImportError, AttributeError, OSError):
+        pass
+
+def _clear_screen():
+    """Clear the terminal with an escape sequence rather than a clear/cls subprocess"""
+    sys.stdout.write(_CLEAR_SCREEN)
+    sys.stdout.flush()
+
 # ============================================================================
 # FOLDER STRUCTURE MANAGER
 # ============================================================================
@@ -60,6 +248,7 @@ class FolderStructure:
             'config': self.base_dir / 'config',
             'cache': self.base_dir / 'cache'
         }
+        self.folders_str = {key: str(path) for key, path in self.folders.items()}
 
     def initialize(self):
         """Create all necessary folders"""
@@ -97,6 +286,10 @@ class FolderStructure:
         """Get path for specific folder"""
         return self.folders.get(key, self.base_dir)
 
+    def get_str(self, key: str) -> str:
+        """Get path for specific folder as a plain string"""
+        return self.folders_str.get(key) or str(self.base_dir)
+
 # ============================================================================
 # CONFIGURATION MANAGER
 # ============================================================================
@@ -109,39 +302,51 @@ class ConfigManager:
         self.config_file = config_dir / 'config.json'
         self.token_file = config_dir / '.token'
 
+        # Read once, then served from memory until the next save
+        self._token = None
+        self._config = None
+
     def load_config(self) -> Dict:
         """Load configuration from file"""
-        if self.config_file.exists():
-            with open(self.config_file, 'r') as f:
-                return json.load(f)
-        return {}
+        if self._config is None:
+            if self.config_file.exists():
+                with open(self.config_file, 'rb') as f:
+                    self._config = _json_loads(f.read())
+            else:
+                self._config = {}
+        return self._config
 
     def save_config(self, config: Dict):
         """Save configuration to file"""
         with open(self.config_file, 'w') as f:
             json.dump(config, f, indent=2)
+        self._config = config
 
     def save_token(self, token: str):
         """Securely save bot token"""
-        with open(self.token_file, 'w') as f:
-            f.write(token)
-        # Set restrictive permissions (Unix-like systems)
-        try:
-            os.chmod(self.token_file, 0o600)
-        except:
-            pass
+        if os.name == 'nt':
+            with open(self.token_file, 'w') as f:
+                f.write(token)
+        else:
+            # Created owner-only, so the token is never readable by others
+            fd = os.open(self.token_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                # O_CREAT's mode only applies to new files; tighten one left by an older version
+                os.fchmod(fd, 0o600)
+                f.write(token)
+        self._token = token
         print(f"{Colors.SUCCESS}✓ Token saved securely{Colors.RESET}")
 
     def load_token(self) -> Optional[str]:
         """Load saved bot token"""
-        if self.token_file.exists():
+        if self._token is None and self.token_file.exists():
             with open(self.token_file, 'r') as f:
-                return f.read().strip()
-        return None
+                self._token = f.read().strip()
+        return self._token
 
     def token_exists(self) -> bool:
         """Check if token is saved"""
-        return self.token_file.exists()
+        return self._token is not None or self.token_file.exists()
 
 # ============================================================================
 # DATABASE MANAGER
@@ -150,14 +355,230 @@ class ConfigManager:
 class DatabaseManager:
     """Manages all SQLite database interactions for USERTEG"""
 
+    # Applied once per connection; WAL lets readers proceed during writes
+    PRAGMAS = (
+        'PRAGMA journal_mode=WAL',
+        'PRAGMA synchronous=NORMAL',
+        'PRAGMA temp_store=MEMORY',
+        'PRAGMA mmap_size=268435456',
+        'PRAGMA cache_size=-65536',
+    )
+
+    # Per-connection settings for the read-only pool; journal mode and
+    # synchronous belong to the writer and are left alone here
+    READER_PRAGMAS = (
+        'PRAGMA temp_store=MEMORY',
+        'PRAGMA mmap_size=268435456',
+        'PRAGMA cache_size=-65536',
+    )
+
+    # An upsert rather than INSERT OR REPLACE keeps the rowid that messages_fts refers to
+    SQL_INSERT_MESSAGE = '''
+        INSERT INTO messages
+        (message_id, chat_id, user_id, username, first_name, message_text, message_date, media_type, forwarded_from, reply_to_message_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(message_id, chat_id) DO UPDATE SET
+            user_id = excluded.user_id,
+            username = excluded.username,
+            first_name = excluded.first_name,
+            message_text = excluded.message_text,
+            message_date = excluded.message_date,
+            media_type = excluded.media_type,
+            forwarded_from = excluded.forwarded_from,
+            reply_to_message_id = excluded.reply_to_message_id
+    '''
+
+    # messages_fts is contentless: it holds only the trigram index, never a copy of
+    # the text. An entry is removed with the FTS5 'delete' command, which needs the
+    # text that was indexed; messages still holds it until the upsert replaces it.
+    SQL_CREATE_MESSAGE_FTS = '''
+        CREATE VIRTUAL TABLE messages_fts
+        USING fts5(text, content='', tokenize='trigram')
+    '''
+
+    SQL_UNINDEX_MESSAGE_TEXT = '''
+        INSERT INTO messages_fts (messages_fts, rowid, text)
+        SELECT 'delete', rowid, unpack_text(message_text) FROM messages
+        WHERE message_id = ? AND chat_id = ?
+    '''
+
+    SQL_INDEX_MESSAGE_TEXT = '''
+        INSERT INTO messages_fts (rowid, text)
+        SELECT rowid, ?3 FROM messages WHERE message_id = ?1 AND chat_id = ?2
+    '''
+
+    # Compares with the latest history entry so repeats within a batch are skipped
+    SQL_INSERT_USERNAME_CHANGE = '''
+        INSERT INTO username_history (user_id, username, changed_at)
+        SELECT ?1, ?4, ?7
+        WHERE ?4 IS NOT NULL AND ?4 IS NOT (
+            SELECT username FROM username_history
+            WHERE user_id = ?1
+            ORDER BY id DESC LIMIT 1
+        )
+    '''
+
+    SQL_UPSERT_USER = '''
+        INSERT INTO users
+        (user_id, first_name, last_name, current_username, is_bot, language_code, first_seen, last_seen)
+        VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7, ?7)
+        ON CONFLICT(user_id) DO UPDATE SET
+            first_name = excluded.first_name,
+            last_name = excluded.last_name,
+            current_username = excluded.current_username,
+            is_bot = excluded.is_bot,
+            language_code = excluded.language_code,
+            last_seen = excluded.last_seen
+    '''
+
+    SQL_SEARCH_USERNAMES_FTS = '''
+        SELECT DISTINCT u.user_id, u.first_name, u.current_username
+        FROM usernames_fts f
+        JOIN users u ON u.user_id = f.user_id
+        WHERE usernames_fts MATCH ?
+    '''
+
+    SQL_SEARCH_USERNAMES_LIKE = '''
+        SELECT DISTINCT u.user_id, u.first_name, u.current_username
+        FROM users u
+        LEFT JOIN username_history uh ON u.user_id = uh.user_id
+        WHERE u.current_username LIKE ? OR uh.username LIKE ?
+    '''
+
+    SQL_USER_MESSAGES = '''
+        SELECT m.message_id, m.chat_id, m.username, m.first_name,
+               unpack_text(m.message_text) AS text, m.message_date AS date, m.media_type,
+               COALESCE(c.title, 'Unknown') AS chat_title
+        FROM messages m
+        LEFT JOIN chats c ON m.chat_id = c.chat_id
+        WHERE m.user_id = ?
+        ORDER BY m.message_date DESC
+        LIMIT ?
+    '''
+
+    # Same rows as SQL_USER_MESSAGES with the text cut to ?3 characters for on-screen previews
+    SQL_USER_MESSAGE_PREVIEWS = '''
+        SELECT m.message_id, m.chat_id, m.username, m.first_name,
+               SUBSTR(unpack_text(m.message_text), 1, ?3) AS text, m.message_date AS date, m.media_type,
+               COALESCE(c.title, 'Unknown') AS chat_title
+        FROM messages m
+        LEFT JOIN chats c ON m.chat_id = c.chat_id
+        WHERE m.user_id = ?1
+        ORDER BY m.message_date DESC
+        LIMIT ?2
+    '''
+
+    SQL_USERNAME_HISTORY = '''
+        SELECT username, changed_at
+        FROM username_history
+        WHERE user_id = ?
+        ORDER BY changed_at DESC
+    '''
+
+    # Keyword search binds ?1 = pattern, ?2 = limit, ?3 = preview length (NULL for the full text)
+    SQL_SEARCH_MESSAGES_FTS = '''
+        SELECT m.message_id, m.chat_id, m.user_id, m.username, m.first_name,
+               CASE WHEN ?3 IS NULL THEN unpack_text(m.message_text)
+                    ELSE SUBSTR(unpack_text(m.message_text), 1, ?3) END AS text,
+               m.message_date AS date, COALESCE(c.title, 'Unknown') AS chat_title
+        FROM messages_fts f
+        JOIN messages m ON m.rowid = f.rowid
+        LEFT JOIN chats c ON m.chat_id = c.chat_id
+        WHERE messages_fts MATCH ?1
+        ORDER BY m.message_date DESC
+        LIMIT ?2
+    '''
+
+    SQL_SEARCH_MESSAGES_LIKE = '''
+        SELECT m.message_id, m.chat_id, m.user_id, m.username, m.first_name,
+               CASE WHEN ?3 IS NULL THEN unpack_text(m.message_text)
+                    ELSE SUBSTR(unpack_text(m.message_text), 1, ?3) END AS text,
+               m.message_date AS date, COALESCE(c.title, 'Unknown') AS chat_title
+        FROM messages m
+        LEFT JOIN chats c ON m.chat_id = c.chat_id
+        WHERE unpack_text(m.message_text) LIKE ?1
+        ORDER BY m.message_date DESC
+        LIMIT ?2
+    '''
+
+    # Keyset pagination: each page starts after the last rowid seen
+    SQL_MESSAGE_TEXT_PAGE = '''
+        SELECT rowid, message_id, chat_id, user_id, unpack_text(message_text) AS text
+        FROM messages
+        WHERE rowid > ?
+        ORDER BY rowid
+        LIMIT ?
+    '''
+
+    SQL_DATABASE_STATS = '''
+        SELECT
+            (SELECT COUNT(*) FROM users),
+            (SELECT COUNT(*) FROM messages),
+            (SELECT COUNT(*) FROM chats),
+            (SELECT COUNT(*) FROM username_history)
+    '''
+
+    # Idle read-only connections kept for reuse, each with its own cursor
+    READER_POOL_SIZE = 4
+
     def __init__(self, db_path: Path):
         self.db_path = db_path
+        # Single writer; lookups use the read-only pool so they run alongside inserts under WAL
+        self._writer_conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False,
+                                            cached_statements=256)
+        self._writer_conn.row_factory = sqlite3.Row
+        self._writer_conn.create_function('unpack_text', 1, _unpack_text, deterministic=True)
+        self._compressor = zstandard.ZstdCompressor(level=3) if zstandard is not None else None
+        for pragma in self.PRAGMAS:
+            self._writer_conn.execute(pragma)
         self._init_database()
+        # Holds cursors rather than connections so lookups reuse one cursor per connection
+        self._reader_pool = queue.LifoQueue()
+
+    def close(self):
+        """Close the writer and all pooled reader connections"""
+        while True:
+            try:
+                self._reader_pool.get_nowait().connection.close()
+            except queue.Empty:
+                break
+        if self._writer_conn is not None:
+            self._writer_conn.close()
+            self._writer_conn = None
+
+    def _open_reader(self) -> sqlite3.Connection:
+        """Open a read-only connection to the database"""
+        uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False, cached_statements=256)
+        conn.row_factory = sqlite3.Row
+        conn.create_function('unpack_text', 1, _unpack_text, deterministic=True)
+        for pragma in self.READER_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    @contextmanager
+    def _reader(self) -> Iterator[sqlite3.Cursor]:
+        """Check a read-only connection's cursor out of the pool for the duration of a query
+
+        Every statement run through it is a class constant, so repeat calls hit the
+        connection's prepared-statement cache instead of re-parsing the SQL.
+        """
+        try:
+            cur = self._reader_pool.get_nowait()
+        except queue.Empty:
+            cur = self._open_reader().cursor()
+        try:
+            yield cur
+        finally:
+            if self._reader_pool.qsize() < self.READER_POOL_SIZE:
+                self._reader_pool.put(cur)
+            else:
+                cur.connection.close()
 
     def _init_database(self):
         """Initialize SQLite database with necessary tables"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._writer_conn.cursor()
+        cursor.execute('BEGIN')
 
         # Users table
         cursor.execute('''
@@ -192,7 +613,7 @@ class DatabaseManager:
                 user_id INTEGER,
                 username TEXT,
                 first_name TEXT,
-                message_text TEXT,
+                message_text BLOB,
                 message_date TIMESTAMP,
                 media_type TEXT,
                 forwarded_from INTEGER,
@@ -229,94 +650,209 @@ class DatabaseManager:
             )
         ''')
 
-        conn.commit()
-        conn.close()
+        # Indexes backing the lookup paths
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_msg_user_date ON messages(user_id, message_date DESC)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_uh_user ON username_history(user_id, changed_at DESC)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_uh_username ON username_history(username COLLATE NOCASE)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_users_username ON users(current_username COLLATE NOCASE)')
+
+        cursor.execute('COMMIT')
+
+        self.fts_enabled = self._init_username_fts()
+        self.message_fts_enabled = self._init_message_fts()
+
+    def _init_username_fts(self) -> bool:
+        """Create the trigram full-text index over usernames, if FTS5 is available"""
+        exists = self._writer_conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'usernames_fts'"
+        ).fetchone()
+        try:
+            with self._writer_conn:
+                self._writer_conn.execute('BEGIN')
+                self._writer_conn.execute('''
+                    CREATE VIRTUAL TABLE IF NOT EXISTS usernames_fts
+                    USING fts5(user_id UNINDEXED, username, tokenize='trigram')
+                ''')
+                # store_users_bulk records every username a user takes in
+                # username_history, so indexing that table covers current names too
+                self._writer_conn.execute('''
+                    CREATE TRIGGER IF NOT EXISTS username_history_fts_ai
+                    AFTER INSERT ON username_history
+                    WHEN new.username IS NOT NULL
+                    BEGIN
+                        INSERT INTO usernames_fts (user_id, username) VALUES (new.user_id, new.username);
+                    END
+                ''')
+                if not exists:
+                    self._writer_conn.execute('''
+                        INSERT INTO usernames_fts (user_id, username)
+                        SELECT user_id, username FROM username_history WHERE username IS NOT NULL
+                        UNION
+                        SELECT user_id, current_username FROM users WHERE current_username IS NOT NULL
+                    ''')
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5 or the trigram tokenizer (< 3.34)
+            return False
+        return True
+
+    def _init_message_fts(self) -> bool:
+        """Create the trigram full-text index over message text, if FTS5 is available"""
+        existing = self._writer_conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'messages_fts'"
+        ).fetchone()
+        try:
+            with self._writer_conn:
+                self._writer_conn.execute('BEGIN')
+                # An index that stores its own copy of the text is rebuilt contentless;
+                # one created with contentless_delete rejects the 'delete' command
+                if existing is not None and ("content=''" not in existing[0]
+                                             or 'contentless_delete' in existing[0]):
+                    self._writer_conn.execute('DROP TABLE messages_fts')
+                    existing = None
+                if existing is None:
+                    # Rows share the messages rowid; store_messages_bulk keeps them in step.
+                    # A trigger cannot be used because the stored text may be zstd-packed.
+                    self._writer_conn.execute(self.SQL_CREATE_MESSAGE_FTS)
+                    self._writer_conn.execute('''
+                        INSERT INTO messages_fts (rowid, text)
+                        SELECT rowid, unpack_text(message_text) FROM messages
+                    ''')
+        except sqlite3.OperationalError:
+            return False
+        return True
+
+    def maintenance(self):
+        """Refresh query planner statistics where they are stale"""
+        # Sample at most ~400 rows per index so this stays quick as the database grows
+        self._writer_conn.execute('PRAGMA analysis_limit=400')
+        self._writer_conn.execute('PRAGMA optimize')
 
     def store_message_data(self, message_id: int, chat_id: int, user_id: int,
                            username: Optional[str], first_name: Optional[str],
                            message_text: str, message_date: str, media_type: Optional[str],
                            forwarded_from: Optional[int], reply_to_message_id: Optional[int]):
         """Store message data in database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            INSERT OR REPLACE INTO messages
-            (message_id, chat_id, user_id, username, first_name, message_text, message_date, media_type, forwarded_from, reply_to_message_id)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (message_id, chat_id, user_id, username, first_name, message_text,
-              message_date, media_type, forwarded_from, reply_to_message_id))
+        self.store_messages_bulk([(message_id, chat_id, user_id, username, first_name, message_text,
+                                   message_date, media_type, forwarded_from, reply_to_message_id)])
 
-        conn.commit()
-        conn.close()
+    def store_messages_bulk(self, rows: List[tuple]):
+        """Store many message rows in a single transaction"""
+        if not rows:
+            return
+        packed = [row[:5] + (_pack_text(row[5], self._compressor),) + row[6:] for row in rows]
+        # A message repeated within the batch is indexed once, with its last text
+        latest = {(row[0], row[1]): row[5] for row in rows} if self.message_fts_enabled else None
+        with self._writer_conn:
+            self._writer_conn.execute('BEGIN IMMEDIATE')
+            if latest:
+                # Unindex stored messages while their old text is still in place
+                self._writer_conn.executemany(self.SQL_UNINDEX_MESSAGE_TEXT, latest)
+            self._writer_conn.executemany(self.SQL_INSERT_MESSAGE, packed)
+            if latest:
+                self._writer_conn.executemany(self.SQL_INDEX_MESSAGE_TEXT,
+                                              (key + (text,) for key, text in latest.items()))
+
+    def store_users_bulk(self, rows: List[tuple]):
+        """Upsert many users and record username changes in a single transaction
+
+        Each row is (user_id, first_name, last_name, username, is_bot, language_code, seen_at).
+        """
+        if not rows:
+            return
+        with self._writer_conn:
+            self._writer_conn.execute('BEGIN IMMEDIATE')
+            self._writer_conn.executemany(self.SQL_INSERT_USERNAME_CHANGE, rows)
+            self._writer_conn.executemany(self.SQL_UPSERT_USER, rows)
 
     def search_usernames(self, username_query: str) -> List[Dict]:
         """Search for usernames (current and historical) in the database."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            SELECT DISTINCT u.user_id, u.first_name, u.current_username
-            FROM users u
-            LEFT JOIN username_history uh ON u.user_id = uh.user_id
-            WHERE u.current_username LIKE ? OR uh.username LIKE ?
-        ''', (f'%{username_query}%', f'%{username_query}%'))
-
-        results = []
-        for uid, first_name, current_username in cursor.fetchall():
-            results.append({
-                'user_id': uid,
-                'first_name': first_name,
-                'current_username': current_username
-            })
-        conn.close()
-        return results
-
-    def get_user_messages(self, user_id: int, limit: int = 50) -> List[Dict]:
-        """Get user's message history"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._reader() as cur:
+            # Trigrams need at least three characters to match anything
+            if self.fts_enabled and len(username_query) >= 3:
+                phrase = '"' + username_query.replace('"', '""') + '"'
+                cursor = cur.execute(self.SQL_SEARCH_USERNAMES_FTS, (phrase,))
+            else:
+                pattern = f'%{username_query}%'
+                cursor = cur.execute(self.SQL_SEARCH_USERNAMES_LIKE, (pattern, pattern))
+            return [dict(row) for row in cursor]
+
+    def get_user_messages(self, user_id: int, limit: int = 50,
+                          preview_len: Optional[int] = None) -> List[Dict]:
+        """Get user's message history, optionally with text cut to preview_len characters"""
+        with self._reader() as cur:
+            if preview_len is None:
+                cursor = cur.execute(self.SQL_USER_MESSAGES, (user_id, limit))
+            else:
+                cursor = cur.execute(self.SQL_USER_MESSAGE_PREVIEWS, (user_id, limit, preview_len))
+            return [dict(row) for row in cursor]
+
+    def get_user_messages_columnar(self, user_id: int, limit: int = -1) -> Dict[str, Any]:
+        """Get user's message history as one sequence per column, for bulk export"""
+        # Keys follow the SELECT order of SQL_USER_MESSAGES
+        columns = {
+            'message_id': array('q'),
+            'chat_id': array('q'),
+            'username': [],
+            'first_name': [],
+            'text': [],
+            'date': [],
+            'media_type': [],
+            'chat_title': []
+        }
+        appenders = [col.append for col in columns.values()]
 
-        cursor.execute('''
-            SELECT m.*, c.title as chat_title
-            FROM messages m
-            LEFT JOIN chats c ON m.chat_id = c.chat_id
-            WHERE m.user_id = ?
-            ORDER BY m.message_date DESC
-            LIMIT ?
-        ''', (user_id, limit))
-
-        messages = []
-        for row in cursor.fetchall():
-            messages.append({
-                'message_id': row[0],
-                'chat_id': row[1],
-                'username': row[3],
-                'first_name': row[4],
-                'text': row[5],
-                'date': row[6],
-                'media_type': row[7],
-                'chat_title': row[10] if len(row) > 10 else 'Unknown'
-            })
-
-        conn.close()
-        return messages
+        with self._reader() as cur:
+            # A separate cursor so the pooled one keeps its Row factory
+            cursor = cur.connection.cursor()
+            cursor.row_factory = None
+            for row in cursor.execute(self.SQL_USER_MESSAGES, (user_id, limit)):
+                for append, value in zip(appenders, row):
+                    append(value)
+        return columns
 
     def get_username_history(self, user_id: int) -> List[Dict]:
         """Get username change history"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            SELECT username, changed_at
-            FROM username_history
-            WHERE user_id = ?
-            ORDER BY changed_at DESC
-        ''', (user_id,))
+        with self._reader() as cur:
+            return [dict(row) for row in cur.execute(self.SQL_USERNAME_HISTORY, (user_id,))]
+
+    def search_messages(self, keyword: str, limit: int = 100,
+                        preview_len: Optional[int] = None) -> List[Dict]:
+        """Search message text by keyword, optionally with text cut to preview_len characters"""
+        with self._reader() as cur:
+            # Trigrams need at least three characters to match anything
+            if self.message_fts_enabled and len(keyword) >= 3:
+                phrase = '"' + keyword.replace('"', '""') + '"'
+                cursor = cur.execute(self.SQL_SEARCH_MESSAGES_FTS, (phrase, limit, preview_len))
+            else:
+                cursor = cur.execute(self.SQL_SEARCH_MESSAGES_LIKE, (f'%{keyword}%', limit, preview_len))
+            return [dict(row) for row in cursor]
+
+    def scan_messages_for_watchlist(self, patterns: List[str], page_size: int = 1000) -> List[Dict]:
+        """Find stored messages matching any watchlist pattern"""
+        return list(watchlist_scan(self._iter_message_texts(page_size), patterns))
+
+    def _iter_message_texts(self, page_size: int) -> Iterator[Tuple[int, int, int, Optional[str]]]:
+        """Yield (message_id, chat_id, user_id, text) for every message, a page at a time"""
+        last_rowid = 0
+        while True:
+            with self._reader() as cur:
+                page = cur.execute(self.SQL_MESSAGE_TEXT_PAGE, (last_rowid, page_size)).fetchall()
+            if not page:
+                return
+            last_rowid = page[-1]['rowid']
+            for row in page:
+                yield row['message_id'], row['chat_id'], row['user_id'], row['text']
 
-        history = [{'username': row[0], 'changed_at': row[1]} for row in cursor.fetchall()]
-        conn.close()
-        return history
+    def get_database_stats(self) -> Dict:
+        """Get row counts for the main tables"""
+        with self._reader() as cur:
+            users, messages, chats, username_changes = cur.execute(self.SQL_DATABASE_STATS).fetchone()
+        return {
+            'users': users,
+            'messages': messages,
+            'chats': chats,
+            'username_changes': username_changes
+        }
 
 # ============================================================================
 # BANNER SYSTEM
@@ -325,9 +861,8 @@ class DatabaseManager:
 class BannerDisplay:
     """Vintage blue gradient ASCII banner system"""
 
-    @staticmethod
-    def show_main_banner():
-        banner = f"""
+    # Built once at class creation; every input is a constant
+    _BANNER = f"""
 {Colors.BLUE1}{Colors.BOLD}
     ╔══════════════════════════════════════════════════════════════════╗
     ║                                                                  ║
@@ -347,14 +882,16 @@ class BannerDisplay:
     [•] Deep User Intelligence          [•] Chat Analytics & Statistics
     [•] Multi-Group Surveillance        [•] Automated Data Collection{Colors.RESET}
 """
-        print(banner)
+    _HEADER_OPEN = f"\n{_C_HDR}{_RULE_HEAVY}\n  "
+    _HEADER_CLOSE = f"\n{_RULE_HEAVY}{Colors.RESET}\n\n"
 
-    @staticmethod
-    def show_section_header(title: str):
-        width = 70
-        print(f"\n{Colors.BLUE2}{Colors.BOLD}{'═' * width}")
-        print(f"  {title.upper()}")
-        print(f"{'═' * width}{Colors.RESET}\n")
+    @classmethod
+    def show_main_banner(cls):
+        print(cls._BANNER)
+
+    @classmethod
+    def show_section_header(cls, title: str):
+        sys.stdout.write(f"{cls._HEADER_OPEN}{title.upper()}{cls._HEADER_CLOSE}")
 
     @staticmethod
     def show_loading(message: str):
@@ -381,44 +918,157 @@ class BannerDisplay:
 # ============================================================================
 
 class UserTegOSINT:
+    # Seconds between planner statistics refreshes while monitoring
+    MAINTENANCE_INTERVAL = 3600
+    # Maximum log entries written per wakeup of the log writer thread
+    LOG_BATCH_SIZE = 256
+    # getUpdates long-poll duration; the HTTP timeout must exceed it. A stop
+    # request waits for the poll in flight, so this also bounds stop and exit time.
+    POLL_TIMEOUT = 5
+    # Pause before polling again after Telegram reports an error
+    POLL_RETRY_DELAY = 1
+
     def __init__(self, token: str, folders: FolderStructure):
         self.token = token
         self.folders = folders
         self.session = requests.Session()
+        self.session.headers.update({'Accept-Encoding': 'gzip'})
+        # One pooled connection keeps TCP/TLS alive across polls
+        self.session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=1))
         self.base_url = f"https://api.telegram.org/bot{token}"
+        # Successful getMe response; the bot's identity is fixed for a given token
+        self._me = None
+
+        # (unix second, formatted string) of the last timestamp rendered
+        self._ts_cache = (None, '')
+
+        # Rows buffered by process_message, written once per update batch
+        self._pending = []
+        self._pending_users = []
+        # Bumped after every stored batch so readers can tell their cached results are stale
+        self.write_generation = 0
+
+        # Background monitoring; per-message echo is turned off while the menu owns the terminal
+        self.echo_messages = True
+        self._monitor_stop = threading.Event()
+        self._monitor_thread = None
+        # Why the background monitor last died, until the menu has reported it
+        self._monitor_error = None
 
         # Setup paths
         self.db_manager = DatabaseManager(folders.get_path('database') / 'intelligence.db')
-        self.log_file = folders.get_path('logs') / f"session_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+        self.log_file = os.path.join(folders.get_str('logs'), f"session_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log")
+
+        # Log entries are serialized and written by a background thread
+        self._log_q = queue.Queue()
+        self._log_thread = threading.Thread(target=self._log_worker, daemon=True)
+        self._log_thread.start()
 
     def log_operation(self, operation: str, data: Any):
-        """Log operations to file"""
-        log_entry = {
-            'timestamp': datetime.now().isoformat(),
+        """Queue an operation for the background log writer"""
+        now = time.time()
+        sec = int(now)
+        self._log_q.put({
+            'timestamp': f"{self._format_second(sec)}.{int((now - sec) * 1_000_000):06d}",
             'operation': operation,
             'data': data
-        }
-        with open(self.log_file, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(log_entry, ensure_ascii=False) + '\n')
+        })
+
+    def _format_second(self, sec: int) -> str:
+        """Format a unix timestamp as local ISO-8601, reusing the previous result within a second"""
+        cached_sec, cached_str = self._ts_cache
+        if sec != cached_sec:
+            cached_str = time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(sec))
+            self._ts_cache = (sec, cached_str)
+        return cached_str
+
+    def _log_worker(self):
+        """Write queued log entries to the session log in batches"""
+        f = None
+        try:
+            while True:
+                entry = self._log_q.get()
+                if entry is None:
+                    break
+                batch = [entry]
+                while len(batch) < self.LOG_BATCH_SIZE:
+                    try:
+                        entry = self._log_q.get_nowait()
+                    except queue.Empty:
+                        break
+                    if entry is None:
+                        break
+                    batch.append(entry)
+
+                lines = []
+                for e in batch:
+                    try:
+                        lines.append(_json_dumps(e) + b'\n')
+                    except (TypeError, ValueError) as err:
+                        # One unserializable entry must not end session logging
+                        logger.warning("Dropped session log entry for %s: %s",
+                                       e.get('operation'), err)
+
+                if f is None:
+                    f = open(self.log_file, 'ab')
+                f.write(b''.join(lines))
+                f.flush()
+
+                if entry is None:
+                    break
+        finally:
+            if f is not None:
+                f.close()
+
+    def close(self, monitor_timeout: Optional[float] = None):
+        """Stop monitoring, flush the session log and release database and HTTP resources"""
+        monitor_stopped = self.stop_monitoring(monitor_timeout)
+        self._log_q.put(None)
+        self._log_thread.join()
+        if monitor_stopped:
+            self.db_manager.close()
+        else:
+            # The monitor may still be writing; its connection is released at process exit
+            logger.warning("Monitoring thread did not stop before shutdown")
+        self.session.close()
 
     def api_call(self, method: str, params: Dict = None) -> Dict:
         """Generic API call handler"""
         try:
             url = f"{self.base_url}/{method}"
             response = self.session.get(url, params=params, timeout=15)
-            data = response.json()
+            data = _json_loads(response.content)
 
             if data.get('ok'):
                 return {'success': True, 'data': data['result']}
             else:
                 return {'success': False, 'error': data.get('description', 'Unknown error')}
         except Exception as e:
+            # Redaction formats the exception text, so skip it when debug output is off
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("API call %s failed: %s", method, self._redact(e))
             return {'success': False, 'error': str(e)}
 
+    def _redact(self, error: Exception) -> str:
+        """Exception text with the bot token masked; requests errors quote the full URL"""
+        return str(error).replace(self.token, '<token>')
+
+    def get_me(self) -> Dict:
+        """Get the bot's identity, calling getMe only until it first succeeds"""
+        if self._me is not None:
+            return self._me
+        result = self.api_call('getMe')
+        if result['success']:
+            self._me = result
+        return result
+
+    def invalidate_me(self):
+        """Forget the cached getMe result so the next get_me asks Telegram again"""
+        self._me = None
+
     def validate_token(self) -> bool:
         """Validate bot token"""
-        result = self.api_call('getMe')
-        return result.get('success', False)
+        return self.get_me().get('success', False)
 
     def process_message(self, message: Dict):
         """Process and store incoming message"""
@@ -430,10 +1080,13 @@ class UserTegOSINT:
         if not all([message.get('message_id'), chat_id, user_id]):
             return
 
-        self.db_manager.store_user_data(user)
-
         message_text = message.get('text', '')
-        message_date = datetime.fromtimestamp(message.get('date', 0)).isoformat()
+        message_date = self._format_second(message.get('date', 0))
+
+        self._pending_users.append((
+            user_id, user.get('first_name'), user.get('last_name'), user.get('username'),
+            int(user.get('is_bot', False)), user.get('language_code'), message_date
+        ))
 
         media_type = None
         if 'photo' in message:
@@ -443,225 +1096,148 @@ class UserTegOSINT:
         elif 'document' in message:
             media_type = 'document'
 
-        # Now using db_manager for message storage
-        self.db_manager.store_message_data(
-            message_id=message.get('message_id'),
-            chat_id=chat_id,
-            user_id=user_id,
-            username=user.get('username'),
-            first_name=user.get('first_name'),
-            message_text=message_text,
-            message_date=message_date,
-            media_type=media_type,
-            forwarded_from=message.get('forward_from', {}).get('id'),
-            reply_to_message_id=message.get('reply_to_message', {}).get('message_id')
-        )
-
-        print(f"{Colors.SUCCESS}[+] Logged: @{user.get('username', user_id)} in {chat.get('title', chat_id)}{Colors.RESET}")
-
-class DatabaseManager:
-    """Manages all SQLite database interactions for USERTEG"""
-
-    def __init__(self, db_path: Path):
-        self.db_path = db_path
-        self._init_database()
-
-    def _init_database(self):
-        """Initialize SQLite database with necessary tables"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # Users table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                user_id INTEGER PRIMARY KEY,
-                first_name TEXT,
-                last_name TEXT,
-                current_username TEXT,
-                is_bot INTEGER,
-                language_code TEXT,
-                first_seen TIMESTAMP,
-                last_seen TIMESTAMP
-            )
-        ''')
-
-        # Username history
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS username_history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER,
-                username TEXT,
-                changed_at TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users(user_id)
-            )
-        ''')
-
-        # Messages
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS messages (
-                message_id INTEGER,
-                chat_id INTEGER,
-                user_id INTEGER,
-                username TEXT,
-                first_name TEXT,
-                message_text TEXT,
-                message_date TIMESTAMP,
-                media_type TEXT,
-                forwarded_from INTEGER,
-                reply_to_message_id INTEGER,
-                PRIMARY KEY (message_id, chat_id)
-            )
-        ''')
-
-        # Chats
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS chats (
-                chat_id INTEGER PRIMARY KEY,
-                chat_type TEXT,
-                title TEXT,
-                username TEXT,
-                description TEXT,
-                member_count INTEGER,
-                first_seen TIMESTAMP,
-                last_updated TIMESTAMP
-            )
-        ''')
-
-        # User activity
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS user_activity (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER,
-                chat_id INTEGER,
-                chat_title TEXT,
-                status TEXT,
-                first_seen TIMESTAMP,
-                last_seen TIMESTAMP,
-                message_count INTEGER DEFAULT 0
-            )
-        ''')
-
-        conn.commit()
-        conn.close()
-
-    def store_message_data(self, message_id: int, chat_id: int, user_id: int,
-                           username: Optional[str], first_name: Optional[str],
-                           message_text: str, message_date: str, media_type: Optional[str],
-                           forwarded_from: Optional[int], reply_to_message_id: Optional[int]):
-        """Store message data in database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            INSERT OR REPLACE INTO messages
-            (message_id, chat_id, user_id, username, first_name, message_text, message_date, media_type, forwarded_from, reply_to_message_id)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (message_id, chat_id, user_id, username, first_name, message_text,
-              message_date, media_type, forwarded_from, reply_to_message_id))
-
-        conn.commit()
-        conn.close()
-
-    def search_usernames(self, username_query: str) -> List[Dict]:
-        """Search for usernames (current and historical) in the database."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            SELECT DISTINCT u.user_id, u.first_name, u.current_username
-            FROM users u
-            LEFT JOIN username_history uh ON u.user_id = uh.user_id
-            WHERE u.current_username LIKE ? OR uh.username LIKE ?
-        ''', (f'%{username_query}%', f'%{username_query}%'))
-
-        results = []
-        for uid, first_name, current_username in cursor.fetchall():
-            results.append({
-                'user_id': uid,
-                'first_name': first_name,
-                'current_username': current_username
-            })
-        conn.close()
-        return results
-
-    def get_user_messages(self, user_id: int, limit: int = 50) -> List[Dict]:
+        self._pending.append((
+            message.get('message_id'),
+            chat_id,
+            user_id,
+            user.get('username'),
+            user.get('first_name'),
+            message_text,
+            message_date,
+            media_type,
+            message.get('forward_from', {}).get('id'),
+            message.get('reply_to_message', {}).get('message_id')
+        ))
+
+        if self.echo_messages:
+            print(f"{Colors.SUCCESS}[+] Logged: @{user.get('username', user_id)} in {chat.get('title', chat_id)}{Colors.RESET}")
+        else:
+            logger.debug("Logged: @%s in %s", user.get('username', user_id), chat.get('title', chat_id))
+
+    def flush_pending(self):
+        """Write buffered users and messages to the database"""
+        self._write_batch(*self._take_pending())
+
+    def _take_pending(self) -> Tuple[List[tuple], List[tuple]]:
+        """Detach the buffered rows so new updates can be collected while they are written"""
+        users, messages = self._pending_users, self._pending
+        self._pending_users, self._pending = [], []
+        return users, messages
+
+    def _write_batch(self, users: List[tuple], messages: List[tuple]):
+        """Store one batch of user and message rows"""
+        self.db_manager.store_users_bulk(users)
+        self.db_manager.store_messages_bulk(messages)
+        if users or messages:
+            self.write_generation += 1
+
+    def get_user_messages(self, user_id: int, limit: int = 50,
+                          preview_len: Optional[int] = None) -> List[Dict]:
         """Get user's message history"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            SELECT m.*, c.title as chat_title
-            FROM messages m
-            LEFT JOIN chats c ON m.chat_id = c.chat_id
-            WHERE m.user_id = ?
-            ORDER BY m.message_date DESC
-            LIMIT ?
-        ''', (user_id, limit))
-
-        messages = []
-        for row in cursor.fetchall():
-            messages.append({
-                'message_id': row[0],
-                'chat_id': row[1],
-                'username': row[3],
-                'first_name': row[4],
-                'text': row[5],
-                'date': row[6],
-                'media_type': row[7],
-                'chat_title': row[10] if len(row) > 10 else 'Unknown'
-            })
-
-        conn.close()
-        return messages
-
-    def get_username_history(self, user_id: int) -> List[Dict]:
-        """Get username change history"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            SELECT username, changed_at
-            FROM username_history
-            WHERE user_id = ?
-            ORDER BY changed_at DESC
-        ''', (user_id,))
-
-        history = [{'username': row[0], 'changed_at': row[1]} for row in cursor.fetchall()]
-        conn.close()
-        return history
-
-# ============================================================================
-# BANNER SYSTEM
+        return self.db_manager.get_user_messages(user_id, limit, preview_len)
 
     def get_username_history(self, user_id: int) -> List[Dict]:
         """Get username change history"""
         return self.db_manager.get_username_history(user_id)
 
-    def search_messages(self, keyword: str, limit: int = 100) -> List[Dict]:
+    def export_user_messages(self, user_id: int) -> Tuple[str, int]:
+        """Export all of a user's messages to a columnar JSON file; returns (path, count)"""
+        columns = self.db_manager.get_user_messages_columnar(user_id)
+        export = {name: list(values) if isinstance(values, array) else values
+                  for name, values in columns.items()}
+        path = os.path.join(
+            self.folders.get_str('exports'),
+            f"user_{user_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        )
+        with open(path, 'wb') as f:
+            f.write(_json_dumps({'user_id': user_id, 'messages': export}))
+        return path, len(columns['message_id'])
+
+    def search_messages(self, keyword: str, limit: int = 100,
+                        preview_len: Optional[int] = None) -> List[Dict]:
         """Search messages by keyword"""
-        return self.db_manager.search_messages(keyword, limit)
+        return self.db_manager.search_messages(keyword, limit, preview_len)
 
     def get_database_stats(self) -> Dict:
         """Get database statistics"""
         return self.db_manager.get_database_stats()
 
-    def start_monitoring(self):
-        """Start message monitoring"""
-        BannerDisplay.show_section_header("MESSAGE MONITORING ACTIVE")
-        BannerDisplay.show_info("Bot is now logging all messages from groups it's in")
-        BannerDisplay.show_warning("Press Ctrl+C to stop monitoring")
-        print()
+    @property
+    def is_monitoring(self) -> bool:
+        """Whether a background monitoring thread is running"""
+        return self._monitor_thread is not None and self._monitor_thread.is_alive()
 
-        last_update_id = 0
+    def start_background_monitoring(self) -> bool:
+        """Monitor messages on a daemon thread; returns False if already running"""
+        if self.is_monitoring:
+            return False
+        self._monitor_stop.clear()
+        self.echo_messages = False
+        self._monitor_thread = threading.Thread(target=self._run_background_monitor,
+                                                name='userteg-monitor', daemon=True)
+        self._monitor_thread.start()
+        return True
 
+    def stop_monitoring(self, timeout: Optional[float] = None) -> bool:
+        """Ask the background monitor to stop and wait for it; returns True once it has exited
+
+        The thread notices the request when its current long-poll returns, so the
+        default timeout allows for one full poll.
+        """
+        if self._monitor_thread is None:
+            return True
+        self._monitor_stop.set()
+        self._monitor_thread.join(self.POLL_TIMEOUT + 5 if timeout is None else timeout)
+        if self._monitor_thread.is_alive():
+            return False
+        self._monitor_thread = None
+        self.echo_messages = True
+        return True
+
+    def take_monitor_error(self) -> Optional[str]:
+        """Return and clear the reason the background monitor stopped on its own, if it did"""
+        error, self._monitor_error = self._monitor_error, None
+        return error
+
+    def _run_background_monitor(self):
         try:
-            while True:
-                response = self.session.get(
-                    f"{self.base_url}/getUpdates",
-                    params={'offset': last_update_id + 1, 'timeout': 30}
-                )
+            self._monitor_loop(self._monitor_stop)
+        except Exception as e:
+            # Reported through the menu; the traceback only goes to the debug log
+            logger.debug("Background monitoring stopped after an error", exc_info=True)
+            self._monitor_error = f"{type(e).__name__}: {self._redact(e)}"
+        finally:
+            self.echo_messages = True
+
+    def _monitor_loop(self, stop: threading.Event):
+        """Poll getUpdates and store messages until stop is set"""
+        last_update_id = 0
+        last_maintenance = time.monotonic()
 
-                data = response.json()
+        # Database writes for one batch overlap the long-poll for the next
+        writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='userteg-db')
+        pending_write = None
+        pending_maintenance = None
+
+        try:
+            while not stop.is_set():
+                try:
+                    response = self.session.get(
+                        f"{self.base_url}/getUpdates",
+                        params={'offset': last_update_id + 1, 'timeout': self.POLL_TIMEOUT},
+                        timeout=self.POLL_TIMEOUT + 5
+                    )
+                    data = _json_loads(response.content)
+                except requests.RequestException as e:
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("getUpdates request failed: %s", self._redact(e))
+                    stop.wait(self.POLL_RETRY_DELAY)
+                    continue
+                except ValueError as e:
+                    # A non-JSON body, e.g. an HTML error page from a gateway
+                    logger.debug("getUpdates returned an unreadable response: %s", e)
+                    stop.wait(self.POLL_RETRY_DELAY)
+                    continue
                 if data.get('ok'):
                     updates = data.get('result', [])
 
@@ -671,176 +1247,304 @@ class DatabaseManager:
                         if 'message' in update:
                             self.process_message(update['message'])
 
-                time.sleep(0.1)
-
-        except KeyboardInterrupt:
-            print(f"\n{Colors.WARNING}[!] Monitoring stopped{Colors.RESET}")
+                    # Keep at most one batch in flight and surface its errors here
+                    if pending_write is not None:
+                        finished, pending_write = pending_write, None
+                        finished.result()
+                    if pending_maintenance is not None and pending_maintenance.done():
+                        finished, pending_maintenance = pending_maintenance, None
+                        finished.result()
+                    pending_write = writer.submit(self._write_batch, *self._take_pending())
+
+                    if time.monotonic() - last_maintenance > self.MAINTENANCE_INTERVAL:
+                        pending_maintenance = writer.submit(self.db_manager.maintenance)
+                        last_maintenance = time.monotonic()
+                else:
+                    logger.debug("getUpdates failed: %s", data.get('description'))
+                    stop.wait(self.POLL_RETRY_DELAY)
+        finally:
+            # Planner statistics are left to the next run so stopping stays quick
+            writer.shutdown(wait=True)
+            if pending_maintenance is not None and pending_maintenance.exception() is not None:
+                logger.warning("Database maintenance failed: %s", pending_maintenance.exception())
+            self.flush_pending()
+            # No later iteration will check the final batch, so raise its error from here
+            if pending_write is not None:
+                pending_write.result()
 
 # ============================================================================
 # INTERACTIVE MENU SYSTEM
 # ============================================================================
 
 class MenuSystem:
+    MENU_OPTIONS = (
+        ("Intelligence Gathering", (
+            "View User Intelligence & History",
+            "Search Username (Current + Historical)",
+            "View User's Message History",
+            "Search Messages by Keyword"
+        )),
+        ("Real-time Monitoring", (
+            "Start/Stop Background Monitoring (24/7)",
+            "View Live Database Statistics"
+        )),
+        ("Analysis & Reports", (
+            "Generate Intelligence Report",
+            "Export Data to JSON"
+        )),
+        ("System", (
+            "View Session Logs",
+            "Bot Information",
+            "Exit USERTEG"
+        ))
+    )
+    # Row fields each viewer prints, pulled out in one call per row
+    _INTEL_FIELDS = itemgetter('date', 'chat_title', 'text')
+    _HISTORY_FIELDS = itemgetter('date', 'chat_title', 'first_name', 'username', 'text')
+    _SEARCH_FIELDS = itemgetter('username', 'text')
+    _USERNAME_FIELDS = itemgetter('username', 'changed_at')
+    _MATCH_FIELDS = itemgetter('first_name', 'current_username', 'user_id')
+    # Seconds a statistics snapshot is reused while monitoring keeps writing
+    STATS_TTL = 5
+    # Distinct lookups remembered per cache until the database changes
+    LOOKUP_CACHE_SIZE = 256
+
     def __init__(self, osint: UserTegOSINT):
         self.osint = osint
+        self._menu_cache = self._build_menu()
+        # Lookups only change when monitoring writes; see _refresh_caches
+        self._cache_generation = self.osint.write_generation
+        # (fetched at, write generation, stats) of the last statistics query
+        self._stats_cache = (float('-inf'), None, None)
+        cache = functools.lru_cache(maxsize=self.LOOKUP_CACHE_SIZE)
+        self._cached_username_history = cache(self.osint.get_username_history)
+        self._cached_user_messages = cache(self.osint.get_user_messages)
+        self._cached_search_usernames = cache(self.osint.db_manager.search_usernames)
+        self._cached_search_messages = cache(self.osint.search_messages)
+        # Independent lookups for one screen run side by side on pooled readers
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='userteg-menu')
+        # One entry per menu item in display order; None ends the session
+        self._dispatch = (
+            self.view_user_intelligence,
+            self.search_username,
+            self.view_message_history,
+            self.search_messages,
+            self.toggle_monitoring,
+            self.show_statistics,
+            self.generate_report,
+            self.export_data,
+            self.view_logs,
+            self.show_bot_info,
+            None
+        )
 
-    def show_menu(self):
-        print(f"\n{Colors.BLUE2}{Colors.BOLD}╔════════════════════════════════════════════════════════════════╗")
-        print(f"║              USERTEG COMMAND CENTER - MAIN MENU                ║")
-        print(f"╚════════════════════════════════════════════════════════════════╝{Colors.RESET}")
-
-        options = [
-            ("Intelligence Gathering", [
-                "View User Intelligence & History",
-                "Search Username (Current + Historical)",
-                "View User's Message History",
-                "Search Messages by Keyword"
-            ]),
-            ("Real-time Monitoring", [
-                "START Message Monitoring (24/7)",
-                "View Live Database Statistics"
-            ]),
-            ("Analysis & Reports", [
-                "Generate Intelligence Report",
-                "Export Data to JSON"
-            ]),
-            ("System", [
-                "View Session Logs",
-                "Bot Information",
-                "Exit USERTEG"
-            ])
+    @classmethod
+    def _build_menu(cls) -> str:
+        """Render the static menu once; show_menu only writes it out"""
+        parts = [
+            f"\n{_C_HDR}╔════════════════════════════════════════════════════════════════╗",
+            f"║              USERTEG COMMAND CENTER - MAIN MENU                ║",
+            f"╚════════════════════════════════════════════════════════════════╝{_C_RESET}"
         ]
 
         counter = 1
-        for category, items in options:
-            print(f"\n{Colors.CYAN2}{Colors.BOLD}  {category}:{Colors.RESET}")
+        for category, items in cls.MENU_OPTIONS:
+            parts.append(f"\n{_C_CAT}  {category}:{_C_RESET}")
             for item in items:
-                print(f"{Colors.CYAN3}    [{counter:2d}] {item}{Colors.RESET}")
+                parts.append(f"{_C_ITEM}    [{counter:2d}] {item}{_C_RESET}")
                 counter += 1
+        return "\n".join(parts) + "\n"
+
+    def show_menu(self):
+        sys.stdout.write(self._menu_cache)
+        self._report_monitor_error()
+
+    def _report_monitor_error(self):
+        error = self.osint.take_monitor_error()
+        if error is not None:
+            BannerDisplay.show_error(f"Background monitoring stopped: {error}")
+            BannerDisplay.show_info("Select option 5 to restart monitoring")
 
     def handle_choice(self, choice: int):
-        if choice == 1:
-            self.view_user_intelligence()
-        elif choice == 2:
-            self.search_username()
-        elif choice == 3:
-            self.view_message_history()
-        elif choice == 4:
-            self.search_messages()
-        elif choice == 5:
-            self.osint.start_monitoring()
-        elif choice == 6:
-            self.show_statistics()
-        elif choice == 7:
-            self.generate_report()
-        elif choice == 8:
-            self.export_data()
-        elif choice == 9:
-            self.view_logs()
-        elif choice == 10:
-            self.show_bot_info()
-        elif choice == 11:
+        if not 1 <= choice <= len(self._dispatch):
+            return True
+        handler = self._dispatch[choice - 1]
+        if handler is None:
             return False
+        handler()
         return True
 
-    def view_user_intelligence(self):
-        BannerDisplay.show_section_header("User Intelligence Lookup")
-        user_id = input(f"{Colors.CYAN2}[?] Enter User ID: {Colors.RESET}").strip()
+    def close(self):
+        """Stop the lookup worker threads"""
+        self._pool.shutdown(wait=True)
+
+    def _refresh_caches(self):
+        """Drop cached lookups if monitoring has stored anything since they were taken"""
+        generation = self.osint.write_generation
+        if generation == self._cache_generation:
+            return
+        self._cache_generation = generation
+        self._cached_username_history.cache_clear()
+        self._cached_user_messages.cache_clear()
+        self._cached_search_usernames.cache_clear()
+        self._cached_search_messages.cache_clear()
 
-        if not user_id.isdigit():
+    @staticmethod
+    def _search_key(query: str) -> str:
+        """Normalise a search term so case variants share one cache entry"""
+        # SQLite LIKE folds ASCII case only, so other text is left as typed
+        return query.lower() if query.isascii() else query
+
+    def toggle_monitoring(self):
+        if self.osint.is_monitoring:
+            BannerDisplay.show_loading("Stopping monitoring after the current poll")
+            if self.osint.stop_monitoring():
+                BannerDisplay.show_success("Monitoring stopped")
+            else:
+                BannerDisplay.show_error("Monitoring is still shutting down")
+        else:
+            self._report_monitor_error()
+            self.osint.start_background_monitoring()
+            BannerDisplay.show_success("Monitoring started in the background")
+            BannerDisplay.show_info("Bot is now logging all messages from groups it's in")
+            BannerDisplay.show_info("Select option 5 again to stop monitoring")
+
+    @staticmethod
+    def _prompt_user_id() -> Optional[int]:
+        """Ask for a user ID; reports the error and returns None if it is not an integer"""
+        try:
+            return int(input(PROMPT_UID))
+        except ValueError:
             BannerDisplay.show_error("Invalid User ID")
+            return None
+
+    def view_user_intelligence(self):
+        BannerDisplay.show_section_header("User Intelligence Lookup")
+        user_id = self._prompt_user_id()
+        if user_id is None:
             return
 
-        history = self.osint.get_username_history(int(user_id))
-        messages = self.osint.get_user_messages(int(user_id), 10)
+        self._refresh_caches()
+        history_future = self._pool.submit(self._cached_username_history, user_id)
+        messages_future = self._pool.submit(self._cached_user_messages, user_id, 5, 100)
+        history, messages = history_future.result(), messages_future.result()
+
+        parts = [
+            f"\n{_C_INFO}{_RULE_LIGHT}{_C_RESET}",
+            f"{_C_BOLD}User ID: {user_id}{_C_RESET}"
+        ]
 
-        print(f"\n{Colors.INFO}{'─' * 70}{Colors.RESET}")
-        print(f"{Colors.BOLD}User ID: {user_id}{Colors.RESET}")
+        append = parts.append
 
         if history:
-            print(f"\n{Colors.WARNING}Username History:{Colors.RESET}")
-            for idx, h in enumerate(history, 1):
-                print(f"  {idx}. @{h['username']} - {h['changed_at']}")
+            append(f"\n{_C_WARNING}Username History:{_C_RESET}")
+            for idx, (username, changed_at) in enumerate(map(self._USERNAME_FIELDS, history), 1):
+                append(f"  {idx}. @{username} - {changed_at}")
 
         if messages:
-            print(f"\n{Colors.SUCCESS}Recent Messages ({len(messages)}):{Colors.RESET}")
-            for idx, msg in enumerate(messages[:5], 1):
-                print(f"\n  [{idx}] {msg['date']}")
-                print(f"      Chat: {msg['chat_title']}")
-                print(f"      {msg['text'][:100]}...")
+            append(f"\n{_C_SUCCESS}Recent Messages ({len(messages)}):{_C_RESET}")
+            for idx, (date, chat_title, text) in enumerate(map(self._INTEL_FIELDS, messages), 1):
+                append(f"\n  [{idx}] {date}\n      Chat: {chat_title}\n      {text}...")
+
+        sys.stdout.write("\n".join(parts) + "\n")
 
     def search_username(self):
         BannerDisplay.show_section_header("Username Search")
-        username = input(f"{Colors.CYAN2}[?] Enter username: {Colors.RESET}").strip()
+        username = input(PROMPT_USERNAME).strip()
 
-        results = self.osint.db_manager.search_usernames(username)
+        self._refresh_caches()
+        results = self._cached_search_usernames(self._search_key(username))
 
         if results:
-            print(f"\n{Colors.SUCCESS}Found {len(results)} match(es):{Colors.RESET}")
-            for idx, res in enumerate(results, 1):
-                print(f"  {idx}. {res['first_name']} (@{res['current_username']}) - ID: {res['user_id']}")
+            parts = [f"\n{_C_SUCCESS}Found {len(results)} match(es):{_C_RESET}"]
+            append = parts.append
+            for idx, (first_name, username, user_id) in enumerate(map(self._MATCH_FIELDS, results), 1):
+                append(f"  {idx}. {first_name} (@{username}) - ID: {user_id}")
+            sys.stdout.write("\n".join(parts) + "\n")
         else:
             BannerDisplay.show_warning("No matches found")
 
     def view_message_history(self):
         BannerDisplay.show_section_header("Message History Viewer")
-        user_id = input(f"{Colors.CYAN2}[?] Enter User ID: {Colors.RESET}").strip()
-
-        if not user_id.isdigit():
-            BannerDisplay.show_error("Invalid User ID")
+        user_id = self._prompt_user_id()
+        if user_id is None:
             return
 
-        messages = self.osint.get_user_messages(int(user_id), 50)
+        self._refresh_caches()
+        messages = self._cached_user_messages(user_id, 50, 150)
 
         if messages:
-            print(f"\n{Colors.SUCCESS}Found {len(messages)} messages:{Colors.RESET}\n")
-            for idx, msg in enumerate(messages, 1):
-                print(f"{Colors.CYAN3}[{idx}] {msg['date']}{Colors.RESET}")
-                print(f"    {Colors.DIM}Chat:{Colors.RESET} {msg['chat_title']}")
-                print(f"    {Colors.DIM}From:{Colors.RESET} {msg['first_name']} (@{msg['username']})")
-                print(f"    {msg['text'][:150]}")
-                print()
+            item, dim, reset = _C_ITEM, _C_DIM, _C_RESET
+            parts = [f"\n{_C_SUCCESS}Found {len(messages)} messages:{reset}\n"]
+            append = parts.append
+            rows = map(self._HISTORY_FIELDS, messages)
+            for idx, (date, chat_title, first_name, username, text) in enumerate(rows, 1):
+                append(f"{item}[{idx}] {date}{reset}\n"
+                       f"    {dim}Chat:{reset} {chat_title}\n"
+                       f"    {dim}From:{reset} {first_name} (@{username})\n"
+                       f"    {text}\n")
+            sys.stdout.write("\n".join(parts) + "\n")
         else:
             BannerDisplay.show_warning("No messages found")
 
     def search_messages(self):
         BannerDisplay.show_section_header("Message Keyword Search")
-        keyword = input(f"{Colors.CYAN2}[?] Enter keyword: {Colors.RESET}").strip()
+        keyword = input(PROMPT_KEYWORD).strip()
 
-        messages = self.osint.search_messages(keyword, 50)
+        self._refresh_caches()
+        messages = self._cached_search_messages(self._search_key(keyword), 50, 100)
 
         if messages:
-            print(f"\n{Colors.SUCCESS}Found {len(messages)} messages:{Colors.RESET}\n")
-            for idx, msg in enumerate(messages, 1):
-                print(f"{Colors.CYAN3}[{idx}]{Colors.RESET} @{msg['username']}: {msg['text'][:100]}...")
+            item, reset = _C_ITEM, _C_RESET
+            parts = [f"\n{_C_SUCCESS}Found {len(messages)} messages:{reset}\n"]
+            append = parts.append
+            for idx, (username, text) in enumerate(map(self._SEARCH_FIELDS, messages), 1):
+                append(f"{item}[{idx}]{reset} @{username}: {text}...")
+            sys.stdout.write("\n".join(parts) + "\n")
         else:
             BannerDisplay.show_warning("No messages found")
 
     def show_statistics(self):
         BannerDisplay.show_section_header("Database Statistics")
-        stats = self.osint.get_database_stats()
-
-        print(f"{Colors.INFO}Total Users Tracked:{Colors.RESET}      {stats['users']}")
-        print(f"{Colors.INFO}Total Messages Logged:{Colors.RESET}    {stats['messages']}")
-        print(f"{Colors.INFO}Total Chats Monitored:{Colors.RESET}    {stats['chats']}")
-        print(f"{Colors.INFO}Username Changes:{Colors.RESET}         {stats['username_changes']}")
+        fetched_at, generation, stats = self._stats_cache
+        current = self.osint.write_generation
+        if generation != current and time.monotonic() - fetched_at >= self.STATS_TTL:
+            stats = self.osint.get_database_stats()
+            self._stats_cache = (time.monotonic(), current, stats)
+
+        info, reset = _C_INFO, _C_RESET
+        sys.stdout.write(
+            f"{info}Total Users Tracked:{reset}      {stats['users']}\n"
+            f"{info}Total Messages Logged:{reset}    {stats['messages']}\n"
+            f"{info}Total Chats Monitored:{reset}    {stats['chats']}\n"
+            f"{info}Username Changes:{reset}         {stats['username_changes']}\n"
+        )
 
     def generate_report(self):
         BannerDisplay.show_info("Report generation feature - Coming soon")
 
     def export_data(self):
-        BannerDisplay.show_info("Data export feature - Coming soon")
+        BannerDisplay.show_section_header("Export User Messages")
+        user_id = self._prompt_user_id()
+        if user_id is None:
+            return
+
+        path, count = self.osint.export_user_messages(user_id)
+        BannerDisplay.show_success(f"Exported {count} messages to {path}")
 
     def view_logs(self):
         BannerDisplay.show_info(f"Log file: {self.osint.log_file}")
 
     def show_bot_info(self):
-        result = self.osint.api_call('getMe')
+        result = self.osint.get_me()
         if result['success']:
             bot = result['data']
-            print(f"\n{Colors.INFO}Bot Name:{Colors.RESET} {bot.get('first_name')}")
-            print(f"{Colors.INFO}Username:{Colors.RESET} @{bot.get('username')}")
-            print(f"{Colors.INFO}Bot ID:{Colors.RESET} {bot.get('id')}")
+            info, reset = _C_INFO, _C_RESET
+            sys.stdout.write(
+                f"\n{info}Bot Name:{reset} {bot.get('first_name')}\n"
+                f"{info}Username:{reset} @{bot.get('username')}\n"
+                f"{info}Bot ID:{reset} {bot.get('id')}\n"
+            )
 
 # ============================================================================
 # MAIN APPLICATION
@@ -852,7 +1556,7 @@ def setup_token(config_manager: ConfigManager) -> str:
 
     if config_manager.token_exists():
         print(f"{Colors.INFO}Existing token found.{Colors.RESET}")
-        use_existing = input(f"{Colors.CYAN2}Use existing token? (y/n): {Colors.RESET}").strip().lower()
+        use_existing = input(PROMPT_USE_EXISTING_TOKEN).strip().lower()
 
         if use_existing == 'y':
             return config_manager.load_token()
@@ -862,17 +1566,29 @@ def setup_token(config_manager: ConfigManager) -> str:
     print(f"  2. Send /newbot and follow instructions")
     print(f"  3. Copy the token provided\n")
 
-    token = input(f"{Colors.CYAN2}[?] Enter your bot token: {Colors.RESET}").strip()
+    token = input(PROMPT_TOKEN).strip()
 
-    save = input(f"{Colors.CYAN2}Save token for future use? (y/n): {Colors.RESET}").strip().lower()
+    save = input(PROMPT_SAVE_TOKEN).strip().lower()
     if save == 'y':
         config_manager.save_token(token)
 
     return token
 
-def main():
-    # Clear screen
-    os.system('clear' if os.name != 'nt' else 'cls')
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="USERTEG - Telegram OSINT Command Center")
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help="show diagnostic messages and tracebacks on stderr")
+    args = parser.parse_args(argv)
+    # Only this module's logger: urllib3's debug lines would print request URLs,
+    # and every Bot API URL carries the token
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG if args.verbose else logging.WARNING)
+    logger.propagate = False
+
+    _enable_ansi_console()
+    _clear_screen()
 
     # Show banner
     BannerDisplay.show_main_banner()
@@ -905,7 +1621,7 @@ def main():
     BannerDisplay.show_success("Bot connected successfully")
 
     # Show bot info
-    result = osint.api_call('getMe')
+    result = osint.get_me()
     if result['success']:
         bot = result['data']
         print(f"\n{Colors.SUCCESS}Connected as:{Colors.RESET} {bot.get('first_name')} (@{bot.get('username')})")
@@ -916,25 +1632,32 @@ def main():
     while True:
         try:
             menu.show_menu()
-            choice = input(f"\n{Colors.CYAN2}{Colors.BOLD}[?] Select option: {Colors.RESET}").strip()
-
-            if not choice.isdigit():
+            try:
+                choice = int(input(PROMPT_CHOICE))
+            except ValueError:
                 BannerDisplay.show_error("Invalid input")
                 continue
 
-            if not menu.handle_choice(int(choice)):
+            if not menu.handle_choice(choice):
                 break
 
         except KeyboardInterrupt:
             print(f"\n{Colors.WARNING}[!] Operation cancelled{Colors.RESET}")
             break
         except Exception as e:
+            logger.debug("Menu action failed", exc_info=True)
             BannerDisplay.show_error(f"Error: {e}")
 
-    print(f"\n{Colors.CYAN2}{Colors.BOLD}{'═' * 70}")
-    print(f"  Thank you for using USERTEG")
-    print(f"  Intelligence data saved to: {folders.base_dir}")
-    print(f"{'═' * 70}{Colors.RESET}\n")
+    if osint.is_monitoring:
+        BannerDisplay.show_loading("Stopping monitoring")
+    try:
+        menu.close()
+        osint.close()
+    except KeyboardInterrupt:
+        # A second Ctrl+C stops waiting for the poll in flight
+        osint.close(monitor_timeout=0)
+
+    sys.stdout.write(f"{_FAREWELL_OPEN}{folders.base_dir}{_FAREWELL_CLOSE}")
 
 if __name__ == '__main__':
     main()